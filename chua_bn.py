@@ -1,41 +1,114 @@
 # -*- coding: utf-8 -*-
 
-import ccxt
+import asyncio
+import os
+import aiohttp
+import ccxt.pro as ccxtpro
+from ccxt.base.errors import AuthenticationError, ExchangeError, NetworkError
+import numpy as np
 import time
 import logging
-from logging.handlers import TimedRotatingFileHandler
-import requests
+import queue
+from dataclasses import dataclass, fields
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 import json
 
+try:
+    import uvloop
+except ImportError:  # uvloop 仅类 Unix 平台可用，缺失时用标准事件循环
+    uvloop = None
+
+try:
+    import orjson
+except ImportError:  # orjson 缺失时退回标准库 json
+    orjson = None
+
+# 黑名单提示只在首次发现时格式化一次
+_BLACKLIST_MSG = "检测到黑名单品种：{}，跳过监控"
+
+
+@dataclass(slots=True)
+class BotConfig:
+    """单个交易所的配置，数值字段解析一次后按属性访问
+
+    风控字段不设默认值：配置里缺失或拼错键名时在启动阶段就报错，
+    而不是带着内置参数悄悄开始交易。
+    """
+    apiKey: str
+    secret: str
+    leverage: float
+    stop_loss_pct: float
+    low_trail_stop_loss_pct: float
+    trail_stop_loss_pct: float
+    higher_trail_stop_loss_pct: float
+    low_trail_profit_threshold: float
+    first_trail_profit_threshold: float
+    second_trail_profit_threshold: float
+    blacklist: tuple = ()
+    apiKeys: tuple = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+@dataclass(slots=True)
+class SymbolState:
+    """单个品种的监控状态，集中存放避免多个 dict/set 重复查找"""
+    highest_profit: float = 0.0
+    tier: str = "无"
+    prev_profit: float | None = None
+    prev_tier: str = "无"
+    blacklisted: bool = False
+
 
 class MultiAssetTradingBot:
     """
     多品种交易机器人，用于监控多个持仓并执行止盈止损策略。
     """
+
+    # 下单参数按方向预先构建，ccxt 不会修改传入的 params，可安全共享
+    _ORDER_PARAMS = {
+        'long': {'type': 'future', 'positionSide': 'long'},
+        'short': {'type': 'future', 'positionSide': 'short'},
+    }
+
     def __init__(self, config, feishu_webhook=None, monitor_interval=4):
-        self.leverage = float(config["leverage"])
-        self.stop_loss_pct = config["stop_loss_pct"]
-        self.low_trail_stop_loss_pct = config["low_trail_stop_loss_pct"]
-        self.trail_stop_loss_pct = config["trail_stop_loss_pct"]
-        self.higher_trail_stop_loss_pct = config["higher_trail_stop_loss_pct"]
-        self.low_trail_profit_threshold = config["low_trail_profit_threshold"]
-        self.first_trail_profit_threshold = config["first_trail_profit_threshold"]
-        self.second_trail_profit_threshold = config["second_trail_profit_threshold"]
+        self.config = config
+        self.leverage = float(config.leverage)
+        self.stop_loss_pct = config.stop_loss_pct
+        self.low_trail_stop_loss_pct = config.low_trail_stop_loss_pct
+        self.trail_stop_loss_pct = config.trail_stop_loss_pct
+        self.higher_trail_stop_loss_pct = config.higher_trail_stop_loss_pct
+        self.low_trail_profit_threshold = config.low_trail_profit_threshold
+        self.first_trail_profit_threshold = config.first_trail_profit_threshold
+        self.second_trail_profit_threshold = config.second_trail_profit_threshold
         self.feishu_webhook = feishu_webhook
-        self.blacklist = set(config.get("blacklist", []))
+        # 档位阈值升序排列，运行时用二分查找代替逐级比较
+        self._tier_thresholds = np.array([
+            self.low_trail_profit_threshold,
+            self.first_trail_profit_threshold,
+            self.second_trail_profit_threshold,
+        ], dtype=np.float64)
+        self._tier_names = ("无", "低档保护止盈", "第一档移动止盈", "第二档移动止盈")
+        self.blacklist = frozenset(config.blacklist)
         self.monitor_interval = monitor_interval  # 从配置文件读取的监控循环时间
 
-        # 配置交易所
-        self.exchange = ccxt.binance({
-            'apiKey': config["apiKey"],
-            'secret': config["secret"],
+        # 配置交易所，使用 ccxt.pro 异步客户端，网络等待期间不再阻塞监控循环
+        # 配置 apiKeys 列表时每把 key 一个客户端，下单按品种哈希分摊，叠加每把 key 的限频额度
+        api_keys = config.apiKeys or [{"apiKey": config.apiKey, "secret": config.secret}]
+        self.exchanges = [ccxtpro.binance({
+            'apiKey': key["apiKey"],
+            'secret': key["secret"],
             'timeout': 3000,
             'rateLimit': 50,
             'options': {
                 'defaultType': 'future',
             },
             # 'proxies': {'http': 'http://127.0.0.1:10100', 'https': 'http://127.0.0.1:10100'},
-        })
+        }) for key in api_keys]
+        self.exchange = self.exchanges[0]
 
         # 配置日志
         log_file = "log/multi_asset_bot.log"
@@ -48,171 +121,310 @@ class MultiAssetTradingBot:
         handler.suffix = "%Y-%m-%d"
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         handler.setFormatter(formatter)
-        logger.addHandler(handler)
 
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+
+        # 日志经队列转交后台线程做格式化和落盘，监控循环只付一次入队成本
+        log_queue = queue.Queue(-1)
+        logger.addHandler(QueueHandler(log_queue))
+        self._log_listener = QueueListener(log_queue, handler, console_handler)
+        self._log_listener.start()
 
         self.logger = logger
 
-        # 用于记录每个持仓的最高盈利值和当前档位
-        self.highest_profits = {}
-        self.current_tiers = {}
-        self.detected_positions = set()
+        # 每个品种一个状态对象，记录最高盈利、当前档位和上一轮快照
+        self.state = {}
+
+        # 飞书通知复用同一个长连接会话，首次发送时在事件循环内创建
+        self._http = None
+        # load_markets 的结果，启动时填充
+        self._markets = None
+        # 心跳日志的上次发出时间（monotonic），首轮必发
+        self._last_heartbeat = float('-inf')
+        # 预热成功的客户端才走 websocket 下单，其余直接 REST
+        self._ws_trading = set()
 
-    def send_feishu_notification(self, message):
+    async def send_feishu_notification(self, message):
         """发送飞书通知"""
         if self.feishu_webhook:
             try:
-                headers = {'Content-Type': 'application/json'}
+                if self._http is None:
+                    self._http = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=3))
                 payload = {
                     "msg_type": "text",
                     "content": {
                         "text": message
                     }
                 }
-                response = requests.post(self.feishu_webhook, json=payload, headers=headers)
-                if response.status_code == 200:
-                    self.logger.info("飞书通知发送成功")
-                else:
-                    self.logger.error("飞书通知发送失败，状态码: %s", response.status_code)
+                async with self._http.post(self.feishu_webhook, json=payload) as response:
+                    if response.status == 200:
+                        self.logger.info("飞书通知发送成功")
+                    else:
+                        self.logger.error("飞书通知发送失败，状态码: %s", response.status)
             except Exception as e:
                 self.logger.error("发送飞书通知时出现异常: %s", str(e))
 
-    def schedule_task(self):
-        """主循环，控制执行时间"""
+    async def schedule_task(self):
+        """主循环，通过 websocket 推送驱动监控"""
         self.logger.info("启动主循环，开始执行任务调度...")
         try:
-            while True:
-                self.monitor_positions()
-                time.sleep(self.monitor_interval)  # 每4秒检查一次持仓
+            # 市场元数据只在首个客户端加载一次，其余客户端直接复用缓存
+            self._markets = await self.exchange.load_markets()
+            for exchange in self.exchanges[1:]:
+                exchange.set_markets(self.exchange.markets)
+            # 预热各客户端带鉴权的交易 websocket，后续下单省去握手开销
+            for exchange in self.exchanges:
+                try:
+                    await exchange.fetch_balance_ws()
+                    self._ws_trading.add(exchange)
+                except Exception as e:
+                    self.logger.warning("预热交易 websocket 失败，该客户端下单走 REST: %s", e)
+            # 启动时先用 REST 拉一次持仓，初始化 detected_positions 等状态
+            positions = await self.fetch_positions()
+            await self._process(positions)
+            await self.monitor_positions_ws()
         except KeyboardInterrupt:
             self.logger.info("程序收到中断信号，开始退出...")
         except Exception as e:
             error_message = f"程序异常退出: {str(e)}"
             self.logger.error(error_message)
-            self.send_feishu_notification(error_message)
+            await self.send_feishu_notification(error_message)
+        finally:
+            # 退出前关闭 websocket 与底层连接，避免事件循环残留未完成任务
+            if self._http is not None:
+                await self._http.close()
+            for exchange in self.exchanges:
+                await exchange.close()
+            self._log_listener.stop()
 
-    def fetch_positions(self):
-        try:
-            positions = self.exchange.fetch_positions()
-            # 过滤出实际持有的持仓
-            held_positions = [
-                pos for pos in positions
-                if float(pos['info'].get('positionAmt', 0)) != 0 and pos.get('side') is not None
-            ]            
-            return held_positions
-        except Exception as e:
-            self.logger.error(f"获取持仓信息时出错: {e}")
-            return []
+    async def fetch_positions(self):
+        # 空仓过滤放在 _process 的抽取循环里，避免对字段做两遍转换
+        # 网络抖动指数退避重试，鉴权错误直接抛给上层退出
+        for attempt in range(3):
+            try:
+                return await self.exchange.fetch_positions()
+            except AuthenticationError:
+                raise
+            except NetworkError as e:
+                self.logger.warning("获取持仓信息网络出错（第%s次）: %s", attempt + 1, e)
+                await asyncio.sleep(0.1 * 2 ** attempt)
+            except ExchangeError as e:
+                self.logger.error("获取持仓信息时出错: %s", e)
+                return []
+        self.logger.error("获取持仓信息重试%s次后仍失败", attempt + 1)
+        return []
 
-    def close_position(self, symbol, amount, side):
+    def _exchange_for(self, symbol):
+        """按品种哈希选择客户端，把下单请求分摊到各 API key 的限频额度上"""
+        return self.exchanges[hash(symbol) % len(self.exchanges)]
+
+    def _round_amount(self, symbol, amount):
+        """按缓存的市场精度规整下单数量，市场信息缺失时原样返回"""
+        if self._markets is not None and symbol in self._markets:
+            return self.exchange.amount_to_precision(symbol, amount)
+        return amount
+
+    async def close_position(self, symbol, amount, side):
+        order_side = 'buy' if side == 'short' else 'sell'
+        amount = self._round_amount(symbol, amount)
+        params = self._ORDER_PARAMS[side]
+        exchange = self._exchange_for(symbol)
         try:
-            order = self.exchange.create_order(symbol, 'MARKET', 'buy' if side == 'short' else 'sell', amount, None, {'type': 'future', 'positionSide': side})
-            self.logger.info(f"已平仓 {symbol}, 数量: {amount}, 方向: {side}")
-            self.send_feishu_notification(f"已平仓 {symbol}, 数量: {amount}, 方向: {side}")
-            self.detected_positions.discard(symbol)
-            self.highest_profits.pop(symbol, None)
-            self.current_tiers.pop(symbol, None)
+            # 预热成功的客户端优先走交易 websocket 下单，失败时回退 REST
+            if exchange in self._ws_trading:
+                try:
+                    order = await exchange.create_order_ws(symbol, 'MARKET', order_side, amount, None, params)
+                except Exception as e:
+                    self.logger.warning("websocket 下单失败，回退 REST: %s", e)
+                    order = await exchange.create_order(symbol, 'MARKET', order_side, amount, None, params)
+            else:
+                order = await exchange.create_order(symbol, 'MARKET', order_side, amount, None, params)
+            self.logger.info("已平仓 %s, 数量: %s, 方向: %s", symbol, amount, side)
+            # 通知不阻塞交易逻辑，交给事件循环异步发送
+            asyncio.create_task(self.send_feishu_notification(f"已平仓 {symbol}, 数量: {amount}, 方向: {side}"))
+            self.state.pop(symbol, None)
             return True
         except Exception as e:
-            self.logger.error(f"平仓 {symbol} 时出错: {e}")
+            self.logger.error("平仓 %s 时出错: %s", symbol, e)
             return False
 
-    def monitor_positions(self):
-        print("移动止盈止损", time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()))  # 输出当前时间到时分秒，便于阅读日志
-        positions = self.fetch_positions()
+    async def monitor_positions_ws(self):
+        """持仓变动由交易所推送，无需按固定间隔轮询"""
+        retry_delay = 1
+        while True:
+            try:
+                positions = await self.exchange.watch_positions()
+            except NetworkError as e:
+                # websocket 重连等瞬时网络错误不退出，退避后继续监听
+                self.logger.warning("watch_positions 网络出错，%s秒后重试: %s", retry_delay, e)
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 30)
+                continue
+            retry_delay = 1
+            await self._process(positions)
+
+    async def _process(self, positions):
+        # 心跳日志限频到每分钟一条，时间戳由日志格式的 asctime 提供，省掉每轮的 localtime 调用
+        now = time.monotonic()
+        if now - self._last_heartbeat >= 60:
+            self._last_heartbeat = now
+            self.logger.info("移动止盈止损监控运行中")
+        # 每个字段只做一次 dict 取值和 float 转换，按列组织后向量化计算盈亏
+        symbols = []
+        sides = []
+        raw = []
         for position in positions:
             symbol = position.get('symbol')
-            position_amt = float(position['info'].get('positionAmt', 0))
-            entry_price = float(position['info'].get('entryPrice', 0))
-            current_price = float(position['info'].get('markPrice', 0))
+            # 黑名单品种在入口处过滤，后续不再参与任何计算，只在首次发现时通知一次
+            if symbol in self.blacklist:
+                if symbol not in self.state:
+                    self.state[symbol] = SymbolState(blacklisted=True)
+                    asyncio.create_task(self.send_feishu_notification(_BLACKLIST_MSG.format(symbol)))
+                continue
+            info = position['info']
             side = position.get('side')
-
+            position_amt = info.get('positionAmt')
+            if position_amt is None:
+                continue
+            position_amt = float(position_amt)
+            if position_amt == 0:
+                continue
             if side is None:
-                self.logger.warning(f"{symbol} 的 'side' 为 None，跳过该持仓")
+                self.logger.warning("%s 的 'side' 为 None，跳过该持仓", symbol)
                 continue
+            symbols.append(symbol)
+            sides.append(side.lower())
+            raw.append((position_amt,
+                        float(info.get('entryPrice', 0)),
+                        float(info.get('markPrice', 0))))
+        if not symbols:
+            return
 
-            side = side.lower()
+        fields = np.array(raw, dtype=np.float64)
+        position_amts = fields[:, 0]
+        entry_prices = fields[:, 1]
+        mark_prices = fields[:, 2]
+        signs = np.where(np.array(sides) == 'long', 1.0, -1.0)
+        profit_pcts = (mark_prices - entry_prices) / entry_prices * 100 * signs
 
-            if symbol in self.blacklist:
-                if symbol not in self.detected_positions:
-                    self.send_feishu_notification(f"检测到黑名单品种：{symbol}，跳过监控")
-                    self.detected_positions.add(symbol)
-                continue
+        # 各品种并发处理，多个品种同时触发平仓时下单请求并行发出
+        tasks = [
+            self._handle_position(symbols[i], sides[i], position_amts[i],
+                                  entry_prices[i], mark_prices[i], profit_pcts[i])
+            for i in range(len(symbols))
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        pending_closes = []
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error("处理持仓时出错: %s", result)
+            elif result is not None:
+                pending_closes.append(result)
 
-            if symbol not in self.detected_positions:
-                self.detected_positions.add(symbol)
-                self.highest_profits[symbol] = 0
-                self.current_tiers[symbol] = "无"
-                self.logger.info(f"首次检测到持仓：{symbol}, 数量: {position_amt}, 开仓价: {entry_price}, 方向: {side}")
-                self.send_feishu_notification(f"首次检测到持仓：{symbol}, 数量: {position_amt}, 开仓价: {entry_price}, 方向: {side}，已重置档位和最高盈利记录，开始监控...")
-
-            if side == 'long':
-                profit_pct = (current_price - entry_price) / entry_price * 100
-            elif side == 'short':
-                profit_pct = (entry_price - current_price) / entry_price * 100
-            else:
+        # 单个触发走 websocket 下单；同一轮多个触发合并成批量接口，一次请求发出
+        if len(pending_closes) == 1:
+            await self.close_position(*pending_closes[0])
+        elif pending_closes:
+            await self._close_positions_batch(pending_closes)
+
+    async def _close_positions_batch(self, decisions):
+        for start in range(0, len(decisions), 5):  # 币安批量下单接口单次最多5笔
+            chunk = decisions[start:start + 5]
+            exchange = self._exchange_for(chunk[0][0])
+            batch = []
+            for symbol, amount, side in chunk:
+                batch.append({
+                    'symbol': exchange.market_id(symbol) if self._markets else symbol,
+                    'side': 'BUY' if side == 'short' else 'SELL',
+                    'type': 'MARKET',
+                    'quantity': str(self._round_amount(symbol, amount)),
+                    'positionSide': side.upper(),
+                })
+            try:
+                responses = await exchange.fapiPrivatePostBatchOrders({'batchOrders': json.dumps(batch)})
+            except Exception as e:
+                self.logger.warning("批量平仓失败，逐笔回退: %s", e)
+                for decision in chunk:
+                    await self.close_position(*decision)
                 continue
+            for (symbol, amount, side), response in zip(chunk, responses):
+                # 批量接口按笔返回，带 code 的条目是失败单，逐笔回退
+                if isinstance(response, dict) and response.get('code') and not response.get('orderId'):
+                    self.logger.warning("批量平仓 %s 失败: %s，逐笔回退", symbol, response)
+                    await self.close_position(symbol, amount, side)
+                    continue
+                self.logger.info("已平仓 %s, 数量: %s, 方向: %s", symbol, amount, side)
+                asyncio.create_task(self.send_feishu_notification(f"已平仓 {symbol}, 数量: {amount}, 方向: {side}"))
+                self.state.pop(symbol, None)
 
-            highest_profit = self.highest_profits.get(symbol, 0)
-            if profit_pct > highest_profit:
-                highest_profit = profit_pct
-                self.highest_profits[symbol] = highest_profit
-
-            current_tier = self.current_tiers.get(symbol, "无")
-            if highest_profit >= self.second_trail_profit_threshold:
-                current_tier = "第二档移动止盈"
-            elif highest_profit >= self.first_trail_profit_threshold:
-                current_tier = "第一档移动止盈"
-            elif highest_profit >= self.low_trail_profit_threshold:
-                current_tier = "低档保护止盈"
-            else:
-                current_tier = "无"
+    async def _handle_position(self, symbol, side, position_amt, entry_price, current_price, profit_pct):
+        st = self.state.get(symbol)
+
+        if st is None:
+            st = self.state[symbol] = SymbolState()
+            self.logger.info("首次检测到持仓：%s, 数量: %s, 开仓价: %s, 方向: %s", symbol, position_amt, entry_price, side)
+            asyncio.create_task(self.send_feishu_notification(f"首次检测到持仓：{symbol}, 数量: {position_amt}, 开仓价: {entry_price}, 方向: {side}，已重置档位和最高盈利记录，开始监控..."))
+
+        if profit_pct > st.highest_profit:
+            st.highest_profit = profit_pct
+        highest_profit = st.highest_profit
 
-            self.current_tiers[symbol] = current_tier
+        current_tier = self._tier_names[np.searchsorted(self._tier_thresholds, highest_profit, side='right')]
+        st.tier = current_tier
 
+        # 盈亏几乎没动且档位未变时，本轮结论与上一轮一致，省掉日志和触发判断
+        if st.prev_profit is not None and abs(profit_pct - st.prev_profit) < 0.01 and current_tier == st.prev_tier:
+            return
+
+        if self.logger.isEnabledFor(logging.INFO):
             self.logger.info(
-                f"监控 {symbol}，数量: {position_amt}，方向: {side}，开仓价: {entry_price}，当前价: {current_price}，浮动盈亏: {profit_pct:.2f}%，最高盈亏: {highest_profit:.2f}%，当前档位: {current_tier}")
+                "监控 %s，数量: %s，方向: %s，开仓价: %s，当前价: %s，浮动盈亏: %.2f%%，最高盈亏: %.2f%%，当前档位: %s",
+                symbol, position_amt, side, entry_price, current_price, profit_pct, highest_profit, current_tier)
 
-            if current_tier == "低档保护止盈":
-                self.logger.info(f"回撤到{self.low_trail_stop_loss_pct:.2f}% 止盈")
-                if profit_pct <= self.low_trail_stop_loss_pct:
-                    self.logger.info(f"{symbol} 触发低档保护止盈，盈亏回撤到: {profit_pct:.2f}%，执行平仓")
-                    self.close_position(symbol, abs(position_amt), side)
-                    continue
+        if current_tier == "低档保护止盈":
+            self.logger.info("回撤到%.2f%% 止盈", self.low_trail_stop_loss_pct)
+            if profit_pct <= self.low_trail_stop_loss_pct:
+                self.logger.info("%s 触发低档保护止盈，盈亏回撤到: %.2f%%，执行平仓", symbol, profit_pct)
+                return (symbol, abs(position_amt), side)
 
-            elif current_tier == "第一档移动止盈":
-                trail_stop_loss = highest_profit * (1 - self.trail_stop_loss_pct)
-                self.logger.info(f"回撤到 {trail_stop_loss:.2f}% 止盈")
-                if profit_pct <= trail_stop_loss:
-                    self.logger.info(
-                        f"{symbol} 达到利润回撤阈值，档位：第一档移动止盈，最高盈亏: {highest_profit:.2f}%，当前盈亏: {profit_pct:.2f}%，执行平仓")
-                    self.close_position(symbol, abs(position_amt), side)
-                    continue
+        elif current_tier == "第一档移动止盈":
+            trail_stop_loss = highest_profit * (1 - self.trail_stop_loss_pct)
+            self.logger.info("回撤到 %.2f%% 止盈", trail_stop_loss)
+            if profit_pct <= trail_stop_loss:
+                self.logger.info(
+                    "%s 达到利润回撤阈值，档位：第一档移动止盈，最高盈亏: %.2f%%，当前盈亏: %.2f%%，执行平仓",
+                    symbol, highest_profit, profit_pct)
+                return (symbol, abs(position_amt), side)
 
-            elif current_tier == "第二档移动止盈":
-                trail_stop_loss = highest_profit * (1 - self.higher_trail_stop_loss_pct)
-                self.logger.info(f"回撤到 {trail_stop_loss:.2f}% 止盈")
-                if profit_pct <= trail_stop_loss:
-                    self.logger.info(
-                        f"{symbol} 达到利润回撤阈值，档位：第二档移动止盈，最高盈亏: {highest_profit:.2f}%，当前盈亏: {profit_pct:.2f}%，执行平仓")
-                    self.close_position(symbol, abs(position_amt), side)
-                    continue
+        elif current_tier == "第二档移动止盈":
+            trail_stop_loss = highest_profit * (1 - self.higher_trail_stop_loss_pct)
+            self.logger.info("回撤到 %.2f%% 止盈", trail_stop_loss)
+            if profit_pct <= trail_stop_loss:
+                self.logger.info(
+                    "%s 达到利润回撤阈值，档位：第二档移动止盈，最高盈亏: %.2f%%，当前盈亏: %.2f%%，执行平仓",
+                    symbol, highest_profit, profit_pct)
+                return (symbol, abs(position_amt), side)
+
+        if profit_pct <= -self.stop_loss_pct:
+            self.logger.info("%s 触发止损，当前盈亏: %.2f%%，执行平仓", symbol, profit_pct)
+            return (symbol, abs(position_amt), side)
 
-            if profit_pct <= -self.stop_loss_pct:
-                self.logger.info(f"{symbol} 触发止损，当前盈亏: {profit_pct:.2f}%，执行平仓")
-                self.close_position(symbol, abs(position_amt), 'sell' if side == 'long' else 'buy')
+        # 只有确定本轮不平仓才记录快照；平仓失败时状态保留，行情未动也会在下一轮重试
+        st.prev_profit = profit_pct
+        st.prev_tier = current_tier
 
 
 if __name__ == '__main__':
-    with open('config.json', 'r') as f:
-        config_data = json.load(f)
+    with open('config.json', 'rb') as f:
+        config_data = (orjson or json).loads(f.read())
     # 选择交易平台，假设这里选择 Binance
-    platform_config = config_data['binance']
+    platform_config = BotConfig.from_dict(config_data['binance'])
     feishu_webhook_url = config_data.get('feishu_webhook')
     monitor_interval = config_data.get("monitor_interval", 4)  # 默认值为4秒
 
     bot = MultiAssetTradingBot(platform_config, feishu_webhook=feishu_webhook_url, monitor_interval=monitor_interval)
-    bot.schedule_task()
\ No newline at end of file
+    if uvloop is not None:
+        uvloop.install()
+    # 设置 BOT_ASYNC_DEBUG=1 可开启调试模式，事件循环会记录阻塞超过100ms的调用
+    asyncio.run(bot.schedule_task(), debug=os.environ.get("BOT_ASYNC_DEBUG") == "1")